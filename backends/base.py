@@ -1,3 +1,4 @@
+import logging
 from abc import ABC, abstractmethod
 from argparse import ArgumentParser, Namespace
 from dataclasses import dataclass
@@ -10,6 +11,8 @@ class JobInfo:
     fluka_path: str
     custom_exe: str | None
     use_dpm: bool = False
+    job_dir: str | None = None
+    base_name: str | None = None
 
 
 class QueueBackend(ABC):
@@ -30,6 +33,15 @@ class QueueBackend(ABC):
     def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
         """Invia il job. Restituisce una stringa descrittiva (job ID, ecc.)."""
 
+    def submit_batch(self, jobs: list[tuple[str | None, JobInfo]], args: Namespace) -> None:
+        """Invia un gruppo di job. Default: un submit per job, errori registrati per job."""
+        for script_path, job_info in jobs:
+            try:
+                result = self.submit(script_path, job_info, args)
+                logging.info("Job %d: %s", job_info.iteration, result)
+            except RuntimeError as e:
+                logging.error("Job %d fallito: %s", job_info.iteration, e)
+
     @abstractmethod
     def table_rows(self, args: Namespace, fluka_path: str, fluka_folder: str) -> list[list[str]]:
         """Restituisce le righe specifiche del backend per la tabella di riepilogo."""
@@ -1,28 +1,45 @@
+import logging
 import os
 from argparse import ArgumentParser, Namespace
-from string import Template
 
 from backends.base import JobInfo, QueueBackend
 from core.display import COLORS
-
-try:
-    import htcondor
-except ImportError:
-    htcondor = None  # type: ignore
+from core.filesystem import write_executable
 
 _MAX_TIME = 345600  # 4 giorni in secondi
 
-_SCRIPT_TEMPLATE = Template("""\
+_SCRIPT_TEMPLATE = """\
 #!/bin/env bash
 
 . /cvmfs/sft.cern.ch/lcg/views/setupViews.sh LCG_97python3 x86_64-centos7-gcc9-opt
 
-$fluka_command $input
-""")
+# Unico script per tutti i job: riceve il nome dell'input come primo argomento
+{fluka_command} $1
+"""
+
+
+def _import_htcondor():
+    # Import pigro: i binding htcondor sono pesanti e servono solo all'invio reale.
+    try:
+        import htcondor
+    except ImportError:
+        raise RuntimeError(
+            "Il pacchetto htcondor non e' installato. Installarlo con: pip install htcondor"
+        ) from None
+    return htcondor
 
 
 class HTCondorBackend(QueueBackend):
 
+    def __init__(self) -> None:
+        self._schedd = None
+
+    def _get_schedd(self):
+        # Connessione allo schedd condivisa tra lanci successivi (es. cartella di YAML)
+        if self._schedd is None:
+            self._schedd = _import_htcondor().Schedd()
+        return self._schedd
+
     def add_args(self, parser: ArgumentParser) -> None:
         parser.add_argument("-q", "--queue", type=str, default="vanilla",
                             help="Universe HTCondor (default: vanilla)")
@@ -52,28 +69,34 @@ class HTCondorBackend(QueueBackend):
         if args.time > _MAX_TIME:
             raise ValueError(f"Il time limit non puo' superare {_MAX_TIME} secondi")
 
-    def generate_script(self, job_info: JobInfo, job_dir: str, args: Namespace) -> str:
+    def generate_script(self, job_info: JobInfo, job_dir: str, args: Namespace) -> None:
+        # Lo script e' condiviso da tutti i job e viene scritto una volta in submit_batch.
+        return None
+
+    def _queue(self, job_info: JobInfo, count: int, args: Namespace) -> str:
+        """Accoda `count` job a partire da job_info.iteration con un solo Submit."""
+        if job_info.job_dir is None or job_info.base_name is None:
+            raise RuntimeError("HTCondorBackend requires job_info.job_dir and job_info.base_name")
+        output_dir = os.path.dirname(job_info.job_dir)
+        name = job_info.base_name
+
         fluka_cmd = f"{job_info.fluka_path}/rfluka -M 1"
         if job_info.use_dpm:
             fluka_cmd += " -d"
         elif job_info.custom_exe is not None:
             fluka_cmd += f" -e {job_info.custom_exe}"
+        script_path = os.path.join(output_dir, f"{name}_condor.sh")
+        write_executable(script_path, _SCRIPT_TEMPLATE.format(fluka_command=fluka_cmd))
 
-        content = _SCRIPT_TEMPLATE.substitute(
-            fluka_command=fluka_cmd,
-            input=job_info.input_file,
-        )
-        script_path = os.path.join(job_dir, f"job_{job_info.iteration:04d}.sh")
-        with open(script_path, "w") as f:
-            f.write(content)
-        os.chmod(script_path, 0o755)
-        return script_path
-
-    def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
+        # $(Process) parte da 0: JobIndex lo riporta alla numerazione delle cartelle job_NNNN
+        input_name = f"{name}_$INT(JobIndex,%04d).inp"
         submit_desc = {
+            "JobIndex": f"$(Process) + {job_info.iteration}",
             "universe": args.queue,
             "executable": script_path,
-            "transfer_input_files": job_info.input_file,
+            "arguments": input_name,
+            "initialdir": os.path.join(output_dir, "job_$INT(JobIndex,%04d)"),
+            "transfer_input_files": input_name,
             "should_transfer_files": args.transfer_files,
             "when_to_transfer_output": "ON_EXIT",
             "output": args.output,
@@ -85,16 +108,27 @@ class HTCondorBackend(QueueBackend):
             "+MaxRuntime": str(args.time),
         }
         if args.dry_run:
-            return f"[dry run] condor_submit {submit_desc}"
-        if htcondor is None:
-            raise RuntimeError(
-                "Il pacchetto htcondor non e' installato. Installarlo con: pip install htcondor"
-            )
-
-        schedd = htcondor.Schedd()
-        result = schedd.submit(htcondor.Submit(submit_desc))
+            return f"[dry run] condor_submit {submit_desc} (queue {count})"
+        sub = _import_htcondor().Submit(submit_desc)
+        # Schedd.submit con count: una sola transazione e un solo RPC per N processi
+        result = self._get_schedd().submit(sub, count=count)
         return f"cluster {result.cluster()}"
 
+    def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
+        return self._queue(job_info, 1, args)
+
+    def submit_batch(self, jobs: list[tuple[str | None, JobInfo]], args: Namespace) -> None:
+        # Un solo Submit e un solo RPC allo schedd per tutti i job (iterazioni contigue).
+        if not jobs:
+            return
+        first, last = jobs[0][1].iteration, jobs[-1][1].iteration
+        try:
+            result = self._queue(jobs[0][1], len(jobs), args)
+        except RuntimeError as e:
+            logging.error("Invio dei job %d-%d fallito: %s", first, last, e)
+            return
+        logging.info("Job %d-%d: %s", first, last, result)
+
     def table_rows(self, args: Namespace, fluka_path: str, fluka_folder: str) -> list[list[str]]:
         C = COLORS
         return [
@@ -113,5 +147,4 @@ class HTCondorBackend(QueueBackend):
 
     def set_priority_queue(self, args: Namespace, queue_name: str) -> None:
         # HTCondor usa 'universe', non una partizione/coda nominata; l'override viene ignorato.
-        import logging as _logging
-        _logging.warning("HTCondorBackend: benchmark_priority_queue ignorato (universe != coda nominata).")
+        logging.warning("HTCondorBackend: benchmark_priority_queue ignorato (universe != coda nominata).")
@@ -1,10 +1,11 @@
+import logging
 import os
 import subprocess
 from argparse import ArgumentParser, Namespace
-from string import Template
 
 from backends.base import JobInfo, QueueBackend
 from core.display import COLORS
+from core.filesystem import write_executable
 from core.utils import parse_time_to_seconds
 
 _DEFAULT_QUEUE = "normal"
@@ -12,23 +13,37 @@ _MAX_TIME = "4-00:00:00"
 
 _MAX_TIME_SECONDS = parse_time_to_seconds(_MAX_TIME)
 
-_SCRIPT_TEMPLATE = Template("""\
+# Dimensione massima di un job array (MAX_JOB_ARRAY_SIZE di default di LSF)
+_MAX_ARRAY_SIZE = 1000
+
+# Job array LSF: un bsub per blocco di job, $LSB_JOBINDEX seleziona la cartella
+_ARRAY_TEMPLATE = """\
 #!/bin/bash
 
-#BSUB -J $input
-#BSUB -n $ntasks
-#BSUB -R "select[mem>$mem]rusage[mem=$mem]"
-#BSUB -W $time
-#BSUB -o $job_dir/%J.out
-#BSUB -e $job_dir/%J.err
-#BSUB -q $queue
+#BSUB -J "{name}[1-{size}]"
+#BSUB -n {ntasks}
+#BSUB -R "select[mem>{mem}]rusage[mem={mem}]"
+#BSUB -W {time}
+#BSUB -o {output_dir}/%J_%I.out
+#BSUB -e {output_dir}/%J_%I.err
+#BSUB -q {queue}
 
-cd $job_dir
+index=$(printf '%04d' $((LSB_JOBINDEX + {offset})))
+cd {output_dir}/job_$index
 
 echo
 echo Launching FLUKA run...
-$fluka_command $job_dir/$input
-""")
+{fluka_command} {output_dir}/job_$index/{name}_$index.inp
+"""
+
+
+def _fluka_command(job_info: JobInfo) -> str:
+    fluka_cmd = f"{job_info.fluka_path}/rfluka -M 1"
+    if job_info.use_dpm:
+        fluka_cmd += " -d"
+    elif job_info.custom_exe is not None:
+        fluka_cmd += f" -e {job_info.custom_exe}"
+    return fluka_cmd
 
 
 class LSFBackend(QueueBackend):
@@ -49,38 +64,60 @@ class LSFBackend(QueueBackend):
         if parse_time_to_seconds(args.time) > _MAX_TIME_SECONDS:
             raise ValueError(f"Il time limit non puo' superare {_MAX_TIME}")
 
-    def generate_script(self, job_info: JobInfo, job_dir: str, args: Namespace) -> str:
-        fluka_cmd = f"{job_info.fluka_path}/rfluka -M 1"
-        if job_info.use_dpm:
-            fluka_cmd += " -d"
-        elif job_info.custom_exe is not None:
-            fluka_cmd += f" -e {job_info.custom_exe}"
-
-        content = _SCRIPT_TEMPLATE.substitute(
-            input=job_info.input_file,
-            fluka_command=fluka_cmd,
-            job_dir=job_dir,
+    def generate_script(self, job_info: JobInfo, job_dir: str, args: Namespace) -> None:
+        # I job sono inviati come job array: lo script e' scritto in _submit_array.
+        return None
+
+    def _submit_array(self, job_info: JobInfo, first: int, last: int, args: Namespace) -> str:
+        """Invia i job first..last come un unico job array con un solo bsub.
+
+        L'indice dell'array parte sempre da 1 (LSF limita il valore dell'indice,
+        non solo il numero di task, a MAX_JOB_ARRAY_SIZE): lo script aggiunge
+        l'offset per ritrovare la cartella job_NNNN.
+        """
+        if job_info.job_dir is None or job_info.base_name is None:
+            raise RuntimeError("LSFBackend requires job_info.job_dir and job_info.base_name")
+        output_dir = os.path.dirname(job_info.job_dir)
+        name = job_info.base_name
+
+        content = _ARRAY_TEMPLATE.format(
+            name=name,
+            size=last - first + 1,
+            offset=first - 1,
+            fluka_command=_fluka_command(job_info),
+            output_dir=output_dir,
             mem=args.mem,
             ntasks=args.ntasks,
             time=args.time,
             queue=args.queue,
         )
-        script_path = os.path.join(job_dir, f"job_{job_info.iteration:04d}.sh")
-        with open(script_path, "w") as f:
-            f.write(content)
-        os.chmod(script_path, 0o755)
-        return script_path
+        script_path = os.path.join(output_dir, f"{name}_array_{first:04d}-{last:04d}.sh")
+        write_executable(script_path, content)
 
-    def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
-        if script_path is None:
-            raise RuntimeError("LSFBackend requires a script file (script_path cannot be None)")
         if args.dry_run:
             return f"[dry run] bsub < {script_path}"
-        with open(script_path) as script_file:
-            result = subprocess.run(["bsub"], stdin=script_file, capture_output=True, text=True)
+        with open(script_path, "rb") as script_file:
+            result = subprocess.run(["bsub"], stdin=script_file, capture_output=True)
         if result.returncode != 0:
-            raise RuntimeError(result.stderr.strip())
-        return result.stdout.strip()
+            raise RuntimeError(result.stderr.decode().strip())
+        return result.stdout.decode().strip()
+
+    def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
+        return self._submit_array(job_info, job_info.iteration, job_info.iteration, args)
+
+    def submit_batch(self, jobs: list[tuple[str | None, JobInfo]], args: Namespace) -> None:
+        # Iterazioni contigue, divise in array di al massimo _MAX_ARRAY_SIZE job.
+        if not jobs:
+            return
+        job_info = jobs[0][1]
+        start, end = job_info.iteration, jobs[-1][1].iteration
+        for first in range(start, end + 1, _MAX_ARRAY_SIZE):
+            last = min(first + _MAX_ARRAY_SIZE - 1, end)
+            try:
+                result = self._submit_array(job_info, first, last, args)
+                logging.info("Job %d-%d: %s", first, last, result)
+            except RuntimeError as e:
+                logging.error("Invio del job array %d-%d fallito: %s", first, last, e)
 
     def table_rows(self, args: Namespace, fluka_path: str, fluka_folder: str) -> list[list[str]]:
         C = COLORS
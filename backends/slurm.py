@@ -1,10 +1,10 @@
 import os
 import subprocess
 from argparse import ArgumentParser, Namespace
-from string import Template
 
 from backends.base import JobInfo, QueueBackend
 from core.display import COLORS
+from core.filesystem import write_executable
 from core.utils import parse_time_to_seconds
 
 _DEFAULT_QUEUE = "production"
@@ -12,38 +12,38 @@ _MAX_TIME = "4-00:00:00"
 
 _MAX_TIME_SECONDS = parse_time_to_seconds(_MAX_TIME)
 
-_SCRIPT_TEMPLATE = Template("""\
+_SCRIPT_TEMPLATE = """\
 #!/bin/bash
 
-#SBATCH --job-name=$input
-#SBATCH --nodes=$nodes
-#SBATCH --mem=$mem
-#SBATCH --ntasks=$ntasks
-#SBATCH --time=$time
-#SBATCH --gres=$gres
+#SBATCH --job-name={input}
+#SBATCH --nodes={nodes}
+#SBATCH --mem={mem}
+#SBATCH --ntasks={ntasks}
+#SBATCH --time={time}
+#SBATCH --gres={gres}
 #SBATCH --output=/farm_out/%u/%x-%j-%N.out
 #SBATCH --error=/farm_out/%u/%x-%j-%N.err
 
-cd /scratch/slurm/$$SLURM_JOB_ID
+cd /scratch/slurm/$SLURM_JOB_ID
 
 # copia il .err di FLUKA ogni 30 secondi
 while true; do
-    cp fluka_*/*.err /farm_out/$$USER/$$SLURM_JOB_NAME-$$SLURM_JOB_ID-live.err 2>/dev/null
+    cp fluka_*/*.err /farm_out/$USER/$SLURM_JOB_NAME-$SLURM_JOB_ID-live.err 2>/dev/null
     sleep 30
 done &
-WATCHER_PID=$$!
+WATCHER_PID=$!
 
 echo
 echo Launching FLUKA run...
-$fluka_command $job_dir/$input
+{fluka_command} {job_dir}/{input}
 
-kill $$WATCHER_PID 2>/dev/null
+kill $WATCHER_PID 2>/dev/null
 
 echo
-echo Job completed. Transferring files to $job_dir
+echo Job completed. Transferring files to {job_dir}
 
-mv ./*.root $job_dir
-""")
+mv ./*.root {job_dir}
+"""
 
 
 class SlurmBackend(QueueBackend):
@@ -75,7 +75,7 @@ class SlurmBackend(QueueBackend):
         elif job_info.custom_exe is not None:
             fluka_cmd += f" -e {job_info.custom_exe}"
 
-        content = _SCRIPT_TEMPLATE.substitute(
+        content = _SCRIPT_TEMPLATE.format(
             input=job_info.input_file,
             fluka_command=fluka_cmd,
             job_dir=job_dir,
@@ -86,9 +86,7 @@ class SlurmBackend(QueueBackend):
             gres=args.gres,
         )
         script_path = os.path.join(job_dir, f"job_{job_info.iteration:04d}.sh")
-        with open(script_path, "w") as f:
-            f.write(content)
-        os.chmod(script_path, 0o755)
+        write_executable(script_path, content)
         return script_path
 
     def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
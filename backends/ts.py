@@ -1,3 +1,4 @@
+import logging
 import subprocess
 from argparse import ArgumentParser, Namespace
 
@@ -16,24 +17,42 @@ class TSBackend(QueueBackend):
     def generate_script(self, job_info: JobInfo, job_dir: str, args: Namespace) -> None:
         return None
 
-    def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
-        fluka_parts = ["rfluka", "-M", "1"]
+    def _command_prefix(self, job_info: JobInfo) -> list[str]:
+        fluka_parts = [f"{job_info.fluka_path}/rfluka", "-M", "1"]
         if job_info.use_dpm:
             fluka_parts.append("-d")
         elif job_info.custom_exe is not None:
             fluka_parts.extend(["-e", job_info.custom_exe])
-        fluka_parts.append(job_info.input_file)
-        cmd_list = ["ts"] + fluka_parts
+        return ["ts"] + fluka_parts
 
+    def _enqueue(self, prefix: list[str], job_info: JobInfo, args: Namespace) -> str:
+        cmd_list = prefix + [job_info.input_file]
         if args.dry_run:
             cmd_str = " ".join(cmd_list)
             return f"[dry run] {cmd_str}"
 
-        result = subprocess.run(cmd_list, capture_output=True, text=True)
+        # rfluka lavora nella directory corrente: il job parte dalla sua cartella
+        result = subprocess.run(cmd_list, capture_output=True, text=True, cwd=job_info.job_dir)
         if result.returncode != 0:
             raise RuntimeError(result.stderr.strip())
         return result.stdout.strip()
 
+    def submit(self, script_path: str | None, job_info: JobInfo, args: Namespace) -> str:
+        return self._enqueue(self._command_prefix(job_info), job_info, args)
+
+    def submit_batch(self, jobs: list[tuple[str | None, JobInfo]], args: Namespace) -> None:
+        # Task Spooler non ha un inserimento multiplo: ogni job resta una chiamata
+        # a ts (che restituisce il proprio ID), ma il comando FLUKA e' costruito una volta.
+        if not jobs:
+            return
+        prefix = self._command_prefix(jobs[0][1])
+        for _, job_info in jobs:
+            try:
+                result = self._enqueue(prefix, job_info, args)
+                logging.info("Job %d: %s", job_info.iteration, result)
+            except RuntimeError as e:
+                logging.error("Job %d fallito: %s", job_info.iteration, e)
+
     def table_rows(self, args: Namespace, fluka_path: str, fluka_folder: str) -> list[list[str]]:
         C = COLORS
         return [
@@ -43,5 +62,4 @@ class TSBackend(QueueBackend):
 
     def set_priority_queue(self, args: Namespace, queue_name: str) -> None:
         # Task Spooler non ha concetto di coda/partizione; l'override viene ignorato.
-        import logging as _logging
-        _logging.warning("TSBackend: benchmark_priority_queue ignorato (nessun concetto di coda).")
+        logging.warning("TSBackend: benchmark_priority_queue ignorato (nessun concetto di coda).")
@@ -12,6 +12,11 @@ def load_yaml_config(path: str, backends: dict[str, QueueBackend]) -> Namespace:
     if not isinstance(data, dict):
         raise ValueError(f"Il file YAML deve contenere un dizionario: {path!r}")
 
+    # YAML legge chiavi come yes/no/on/off come booleani: Namespace richiede stringhe
+    bad_keys = [k for k in data if not isinstance(k, str)]
+    if bad_keys:
+        raise ValueError(f"Chiavi non valide in {path!r}: {bad_keys!r} (usare ad es. 'assume_yes')")
+
     backend_name = data.get("backend")
     if not backend_name:
         raise ValueError(f"Campo 'backend' mancante in {path!r}")
@@ -29,6 +34,7 @@ def load_yaml_config(path: str, backends: dict[str, QueueBackend]) -> Namespace:
     parser.add_argument("--custom-exe", dest="custom_exe", default=None)
     parser.add_argument("--dpm", dest="use_dpm", action="store_true", default=False)
     parser.add_argument("--dry-run",    dest="dry_run",    action="store_true", default=False)
+    parser.add_argument("--assume-yes", dest="assume_yes", action="store_true", default=False)
     parser.add_argument("--output-dir", dest="output_dir", default=None)
     parser.add_argument("--nprim",      dest="nprim",      type=int, default=None)
     backend.add_args(parser)
@@ -1,7 +1,4 @@
-from colorama import Fore, Style, init
-from tabulate import tabulate
-
-init(autoreset=True)
+from colorama import Fore, Style
 
 COLORS = {
     "G":  Fore.GREEN,
@@ -14,7 +11,17 @@ COLORS = {
 }
 
 
+_initialized = False
+
+
 def print_table(rows: list[list[str]]) -> None:
+    # tabulate e l'init di colorama servono solo quando la tabella viene stampata
+    global _initialized
+    from tabulate import tabulate
+    if not _initialized:
+        from colorama import init
+        init(autoreset=True)
+        _initialized = True
     print(tabulate(rows, headers="firstrow", tablefmt="simple_outline"))
 
 
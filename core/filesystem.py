@@ -1,20 +1,37 @@
 import os
-import shutil
 
 
 def setup_output_dir(base_name: str, output_dir: str | None) -> str:
     base = base_name if output_dir is None else output_dir
     name = base
     counter = 1
-    while os.path.exists(name):
-        name = f"{base}_{counter}"
-        counter += 1
-    os.makedirs(name)
-    return name
+    # mkdir e' atomico: niente stat preliminare e nessuna corsa tra lanci concorrenti
+    while True:
+        try:
+            os.makedirs(name)
+            return name
+        except FileExistsError:
+            name = f"{base}_{counter}"
+            counter += 1
 
 
-def setup_job_dir(output_dir: str, iteration: int, input_file: str) -> str:
+def setup_job_dir(output_dir: str, iteration: int) -> str:
     job_dir = os.path.join(output_dir, f"job_{iteration:04d}")
-    os.makedirs(job_dir)
-    shutil.copy(input_file, job_dir)
+    os.mkdir(job_dir)
     return os.path.abspath(job_dir)
+
+
+def write_file(path: str, data: bytes, mode: int = 0o666) -> None:
+    """Write data to path in one buffer: a single os.write for regular files."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_executable(path: str, content: str) -> None:
+    """Write an executable script: mode bits set at creation, no separate chmod."""
+    write_file(path, content.encode(), 0o755)
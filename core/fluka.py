@@ -3,8 +3,15 @@ import os
 import random
 import re
 import subprocess
+from dataclasses import dataclass
 from pathlib import Path
 
+from core.filesystem import write_file
+
+_SEED_MAX = 90_000_000
+# 'd' e non 'n': il formato 'n' dipende da LC_NUMERIC e puo' inserire separatori
+_RZ_FMT = "RANDOMIZ          1.{:>10d}\n".format
+
 
 def parse_randomiz(inp_path: Path) -> int | None:
     """Return the RANDOMIZ seed (WHAT(2)) from a FLUKA input, or None.
@@ -13,7 +20,8 @@ def parse_randomiz(inp_path: Path) -> int | None:
     numeric token on the RANDOMIZ line.
     """
     try:
-        lines = Path(inp_path).read_text().splitlines()
+        # Le card FLUKA sono ASCII; i commenti possono contenere byte in altre codifiche
+        lines = Path(inp_path).read_bytes().decode("ascii", errors="replace").splitlines()
     except OSError:
         return None
     for line in lines:
@@ -27,13 +35,13 @@ def parse_randomiz(inp_path: Path) -> int | None:
     return None
 
 
-def allocate_seed(used: set[int]) -> int:
-    """Draw a seed in [1, 9e7] not already in `used`; record and return it."""
-    while True:
-        seed = random.randint(1, int(9e7))
-        if seed not in used:
-            used.add(seed)
-            return seed
+def allocate_seeds(used: set[int], n: int) -> list[int]:
+    """Draw n distinct seeds in [1, _SEED_MAX] not already in `used`; record and return them."""
+    # Sampling n + len(used) distinct values guarantees at least n outside `used`.
+    candidates = random.sample(range(1, _SEED_MAX + 1), n + len(used))
+    seeds = [s for s in candidates if s not in used][:n]
+    used.update(seeds)
+    return seeds
 
 
 def scan_existing_seeds(output_dir: Path) -> set[int]:
@@ -63,40 +71,51 @@ def find_duplicate_seeds(output_dir: Path) -> dict[int, list[Path]]:
 
 
 def detect_fluka_path() -> tuple[str, str]:
+    """Return (bin, folder) of the FLUKA installation.
+
+    FLUKA_BIN / FLUKA_PATH from the environment take precedence (e.g. set
+    once by a bulk launch driver); otherwise fluka-config is queried.
+    """
+    bin_path = os.environ.get("FLUKA_BIN")
+    folder_path = os.environ.get("FLUKA_PATH")
+    if bin_path and folder_path:
+        return bin_path, folder_path
     try:
         bin_path = subprocess.check_output(["fluka-config", "--bin"]).decode().strip()
         folder_path = subprocess.check_output(["fluka-config", "--path"]).decode().strip()
-        return bin_path, folder_path
     except (subprocess.CalledProcessError, FileNotFoundError):
         logging.error("FLUKA non trovato. Assicurati che fluka-config sia nel PATH.")
         raise SystemExit(1)
+    return bin_path, folder_path
 
 
-def generate_input(base_name: str, iteration: int, work_dir: str, nprim: int | None = None, seed: int | None = None) -> str:
-    if seed is None:
-        seed = random.randint(1, int(9e7))
-    new_randomiz = f"RANDOMIZ          1.{seed:>10d}\n"
-
-    src = os.path.join(work_dir, f"{base_name}.inp")
-    with open(src, "r+") as f:
-        data = f.readlines()
-        for i, line in enumerate(data):
-            if "RANDOMIZ" in line:
-                data[i] = new_randomiz
+@dataclass(frozen=True)
+class InputTemplate:
+    """A FLUKA input split around its RANDOMIZ card, pre-encoded for writing."""
+    prefix: bytes
+    suffix: bytes
+
+
+def load_input_template(src_path: str, nprim: int | None = None) -> InputTemplate:
+    """Read src_path once, apply the START override and locate the RANDOMIZ card."""
+    # Lettura binaria: i byte dell'input (commenti non ASCII inclusi) restano intatti
+    with open(src_path, "rb") as f:
+        lines = f.readlines()
+    if nprim is not None:
+        for i, line in enumerate(lines):
+            if line.startswith(b"START"):
+                lines[i] = b"START   %10d.0\n" % nprim
                 break
         else:
-            raise ValueError(f"No RANDOMIZ card found in {src!r}")
-        if nprim is not None:
-            for i, line in enumerate(data):
-                if line.startswith("START"):
-                    data[i] = f"START   {nprim:>10d}.0\n"
-                    break
-            else:
-                raise ValueError(f"No START card found in {src!r}")
-        f.seek(0)
-        f.writelines(data)
-        f.truncate()
-
-    filename = f"{base_name}_{iteration:04d}.inp"
-    os.rename(src, os.path.join(work_dir, filename))
-    return filename
+            raise ValueError(f"No START card found in {src_path!r}")
+    rz_idx = next((i for i, line in enumerate(lines) if b"RANDOMIZ" in line), None)
+    if rz_idx is None:
+        raise ValueError(f"No RANDOMIZ card found in {src_path!r}")
+    return InputTemplate(b"".join(lines[:rz_idx]), b"".join(lines[rz_idx + 1:]))
+
+
+def generate_input(template: InputTemplate, dst_path: str, seed: int | None = None) -> None:
+    """Write dst_path from the template with a new RANDOMIZ seed."""
+    if seed is None:
+        seed = random.randint(1, _SEED_MAX)
+    write_file(dst_path, template.prefix + _RZ_FMT(seed).encode() + template.suffix)
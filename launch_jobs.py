@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TypedDict
 
@@ -23,6 +24,9 @@ BACKENDS = {
     "ts":     TSBackend(),
 }
 
+# Thread usati per preparare le cartelle dei job (I/O su filesystem, spesso NFS)
+_PREPARE_WORKERS = 32
+
 class _BenchmarkParams(TypedDict):
     njobs: int
     nprim: int
@@ -52,6 +56,15 @@ def _apply_benchmark_overrides(args: Namespace, mode: str, backend: QueueBackend
         backend.set_priority_queue(args, queue_name)
 
 
+def _show_summary() -> bool:
+    """True se la tabella di riepilogo puo' essere letta da qualcuno.
+
+    Con stdin o stdout collegati a un terminale (anche con `| tee launch.log`)
+    la tabella precede la conferma; la si omette solo se nessuno dei due lo e'.
+    """
+    return sys.stdin.isatty() or sys.stdout.isatty()
+
+
 def _build_parser() -> ArgumentParser:
     parser = ArgumentParser(
         description=(
@@ -117,6 +130,9 @@ def _build_parser() -> ArgumentParser:
                          dest="dry_run",
                          help="Modalita' dry-run: costruisce gli script e mostra i comandi "
                               "senza inviare alcun job al sistema di code")
+        sub.add_argument("-y", "--yes",        action="store_true",
+                         dest="assume_yes",
+                         help="Salta la tabella di riepilogo e la conferma (uso da script)")
         sub.add_argument("-d", "--output-dir", type=str, default=None,
                          dest="output_dir",
                          help="Directory radice dove creare le sottocartelle dei job "
@@ -141,19 +157,27 @@ def _execute_jobs(args: Namespace, fluka_path: str) -> None:
 
     backend = BACKENDS[args.backend]
     base_name = os.path.splitext(os.path.basename(args.input))[0]
+    template = fluka.load_input_template(args.input, args.nprim)
     output_dir = filesystem.setup_output_dir(base_name, args.output_dir)
 
     used_seeds = fluka.scan_existing_seeds(Path(output_dir))
 
-    # Fase 1: genera tutti gli input (un seed unico per job)
-    prepared: list[tuple[int, str, JobInfo]] = []
-    for i in range(1, args.njobs + 1):
-        job_dir = filesystem.setup_job_dir(output_dir, i, args.input)
-        seed = fluka.allocate_seed(used_seeds)
-        new_input = fluka.generate_input(base_name, i, job_dir, nprim=args.nprim, seed=seed)
+    # Fase 1: genera tutti gli input (un seed unico per job) e gli script.
+    # I seed sono estratti prima, in sequenza; il lavoro su disco di ogni job
+    # e' indipendente e viene eseguito in parallelo.
+    seeds = fluka.allocate_seeds(used_seeds, args.njobs)
+    use_dpm = getattr(args, "use_dpm", False)
+
+    def _prepare_job(i: int) -> tuple[str | None, JobInfo]:
+        job_dir = filesystem.setup_job_dir(output_dir, i)
+        new_input = f"{base_name}_{i:04d}.inp"
+        fluka.generate_input(template, os.path.join(job_dir, new_input), seed=seeds[i - 1])
         job_info = JobInfo(new_input, i, fluka_path, args.custom_exe,
-                           use_dpm=getattr(args, "use_dpm", False))
-        prepared.append((i, job_dir, job_info))
+                           use_dpm=use_dpm, job_dir=job_dir, base_name=base_name)
+        return backend.generate_script(job_info, job_dir, args), job_info
+
+    with ThreadPoolExecutor(max_workers=_PREPARE_WORKERS) as executor:
+        jobs = list(executor.map(_prepare_job, range(1, args.njobs + 1)))
 
     # Fase 2: verifica seed unici su disco prima di inviare alcun job
     duplicates = fluka.find_duplicate_seeds(Path(output_dir))
@@ -165,13 +189,7 @@ def _execute_jobs(args: Namespace, fluka_path: str) -> None:
         sys.exit(1)
 
     # Fase 3: invia i job
-    for i, job_dir, job_info in prepared:
-        script_path = backend.generate_script(job_info, job_dir, args)
-        try:
-            result = backend.submit(script_path, job_info, args)
-            logging.info("Job %d: %s", i, result)
-        except RuntimeError as e:
-            logging.error("Job %d fallito: %s", i, e)
+    backend.submit_batch(jobs, args)
 
 
 def run_from_args(args: Namespace) -> None:
@@ -188,18 +206,23 @@ def run_from_args(args: Namespace) -> None:
         logging.error(str(e))
         sys.exit(1)
 
-    C = display.COLORS
-    common_rows = [
-        ["Flag", "Parametro", "Valore"],
-        ["-f", f"{C['R']}Input file{C['RE']}",  f"{C['M']}{args.input}{C['RE']}"],
-        ["-n", f"{C['R']}Numero job{C['RE']}",  f"{C['M']}{args.njobs}{C['RE']}"],
-        ["-c", f"{C['M']}Custom exe{C['RE']}",  f"{C['M']}{args.custom_exe or 'None'}{C['RE']}"],
-        ["-D", f"{C['M']}DPM{C['RE']}",        f"{C['M']}{getattr(args, 'use_dpm', False)}{C['RE']}"],
-        ["-d", f"{C['B']}Output dir{C['RE']}",  f"{C['B']}{args.output_dir or 'Default'}{C['RE']}"],
-        ["-N", f"{C['C']}N. primarie{C['RE']}", f"{C['C']}{args.nprim if args.nprim is not None else 'dal file'}{C['RE']}"],
-        ["-w", f"{C['Y']}Dry run{C['RE']}",     f"{C['Y']}{args.dry_run}{C['RE']}"],
-    ]
-    display.print_table(common_rows + backend.table_rows(args, fluka_path, fluka_folder))
+    if getattr(args, "assume_yes", False):
+        _execute_jobs(args, fluka_path)
+        return
+
+    if _show_summary():
+        C = display.COLORS
+        common_rows = [
+            ["Flag", "Parametro", "Valore"],
+            ["-f", f"{C['R']}Input file{C['RE']}",  f"{C['M']}{args.input}{C['RE']}"],
+            ["-n", f"{C['R']}Numero job{C['RE']}",  f"{C['M']}{args.njobs}{C['RE']}"],
+            ["-c", f"{C['M']}Custom exe{C['RE']}",  f"{C['M']}{args.custom_exe or 'None'}{C['RE']}"],
+            ["-D", f"{C['M']}DPM{C['RE']}",        f"{C['M']}{getattr(args, 'use_dpm', False)}{C['RE']}"],
+            ["-d", f"{C['B']}Output dir{C['RE']}",  f"{C['B']}{args.output_dir or 'Default'}{C['RE']}"],
+            ["-N", f"{C['C']}N. primarie{C['RE']}", f"{C['C']}{args.nprim if args.nprim is not None else 'dal file'}{C['RE']}"],
+            ["-w", f"{C['Y']}Dry run{C['RE']}",     f"{C['Y']}{args.dry_run}{C['RE']}"],
+        ]
+        display.print_table(common_rows + backend.table_rows(args, fluka_path, fluka_folder))
 
     if not display.confirm():
         logging.info("Lancio annullato.")
@@ -231,19 +254,22 @@ def run_folder(folder: str) -> None:
         logging.error("Nessuna configurazione valida trovata.")
         return
 
-    C = display.COLORS
-    rows = [["File", "Backend", "N. job"]]
-    for path, cfg in configs:
-        rows.append([
-            os.path.basename(path),
-            f"{C['M']}{cfg.backend}{C['RE']}",
-            f"{C['M']}{cfg.njobs}{C['RE']}",
-        ])
-    display.print_table(rows)
-
-    if not display.confirm(f"Procedere con {len(configs)} lanci? (yes/no): "):
-        logging.info("Lancio annullato.")
-        return
+    # Tabella e conferma saltate solo se tutti i config hanno 'assume_yes: true'
+    if not all(cfg.assume_yes for _, cfg in configs):
+        if _show_summary():
+            C = display.COLORS
+            rows = [["File", "Backend", "N. job"]]
+            for path, cfg in configs:
+                rows.append([
+                    os.path.basename(path),
+                    f"{C['M']}{cfg.backend}{C['RE']}",
+                    f"{C['M']}{cfg.njobs}{C['RE']}",
+                ])
+            display.print_table(rows)
+
+        if not display.confirm(f"Procedere con {len(configs)} lanci? (yes/no): "):
+            logging.info("Lancio annullato.")
+            return
 
     fluka_path, _ = fluka.detect_fluka_path()
     failures = 0
@@ -302,18 +328,20 @@ def run_benchmark(mode: str, target: str) -> None:
             + (", priority_queue override active" if params["use_priority_queue"] else "")
             + "]"
         )
-        rows = [["File", "Backend", "N. job (benchmark)"]]
-        for path, cfg in configs:
-            rows.append([
-                os.path.basename(path),
-                f"{C['M']}{cfg.backend}{C['RE']}",
-                f"{C['M']}{cfg.njobs}{C['RE']}",
-            ])
-        display.print_table(rows)
-
-        if not display.confirm(f"Procedere con {len(configs)} lanci benchmark? (yes/no): "):
-            logging.info("Lancio annullato.")
-            return
+        if not all(cfg.assume_yes for _, cfg in configs):
+            if _show_summary():
+                rows = [["File", "Backend", "N. job (benchmark)"]]
+                for path, cfg in configs:
+                    rows.append([
+                        os.path.basename(path),
+                        f"{C['M']}{cfg.backend}{C['RE']}",
+                        f"{C['M']}{cfg.njobs}{C['RE']}",
+                    ])
+                display.print_table(rows)
+
+            if not display.confirm(f"Procedere con {len(configs)} lanci benchmark? (yes/no): "):
+                logging.info("Lancio annullato.")
+                return
 
         fluka_path, _ = fluka.detect_fluka_path()
         failures = 0
@@ -360,7 +388,7 @@ def run_benchmark(mode: str, target: str) -> None:
             + (", priority_queue override active" if params["use_priority_queue"] else "")
             + "]"
         )
-        if not display.confirm("Procedere con lancio benchmark? (yes/no): "):
+        if not cfg.assume_yes and not display.confirm("Procedere con lancio benchmark? (yes/no): "):
             logging.info("Lancio annullato.")
             return
         fluka_path, _ = fluka.detect_fluka_path()
@@ -0,0 +1,24 @@
+import os
+
+from core import filesystem
+
+
+def test_setup_output_dir_probes_past_existing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "sim").mkdir()
+    (tmp_path / "sim_1").mkdir()
+    assert filesystem.setup_output_dir("sim", None) == "sim_2"
+    assert filesystem.setup_output_dir("sim", None) == "sim_3"
+
+
+def test_setup_output_dir_uses_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert filesystem.setup_output_dir("sim", "runs/a") == "runs/a"
+    assert filesystem.setup_output_dir("sim", "runs/a") == "runs/a_1"
+
+
+def test_write_executable_mode(tmp_path):
+    path = tmp_path / "job.sh"
+    filesystem.write_executable(str(path), "echo hi\n")
+    assert path.read_text() == "echo hi\n"
+    assert os.access(path, os.X_OK)
@@ -0,0 +1,119 @@
+import os
+from argparse import Namespace
+
+import pytest
+
+import launch_jobs
+from core import fluka
+
+INP = (
+    b"TITLE\n"
+    b"START          100.0\n"
+    b"RANDOMIZ          1.      1234\n"
+    b"STOP\n"
+)
+
+
+def _write_inp(tmp_path, content=INP, name="sim.inp"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_template_splits_around_randomiz(tmp_path):
+    template = fluka.load_input_template(str(_write_inp(tmp_path)))
+    assert template.prefix == b"TITLE\nSTART          100.0\n"
+    assert template.suffix == b"STOP\n"
+
+
+def test_template_overrides_start(tmp_path):
+    template = fluka.load_input_template(str(_write_inp(tmp_path)), nprim=5000)
+    assert template.prefix == b"TITLE\nSTART         5000.0\n"
+
+
+def test_generate_input_writes_seed(tmp_path):
+    template = fluka.load_input_template(str(_write_inp(tmp_path)))
+    dst = tmp_path / "sim_0001.inp"
+    fluka.generate_input(template, str(dst), seed=42)
+    assert dst.read_bytes() == (
+        b"TITLE\nSTART          100.0\nRANDOMIZ          1.        42\nSTOP\n"
+    )
+    assert fluka.parse_randomiz(dst) == 42
+
+
+@pytest.mark.parametrize("content, nprim, card", [
+    (b"TITLE\nSTART          100.0\nSTOP\n", None, "RANDOMIZ"),
+    (b"TITLE\nRANDOMIZ          1.      1234\nSTOP\n", 10, "START"),
+])
+def test_missing_card_aborts_before_output_dir(tmp_path, monkeypatch, content, nprim, card):
+    monkeypatch.chdir(tmp_path)
+    _write_inp(tmp_path, content)
+    args = Namespace(
+        backend="slurm", input="sim.inp", njobs=2, custom_exe=None, use_dpm=False,
+        output_dir=None, nprim=nprim, dry_run=True,
+    )
+    with pytest.raises(ValueError, match=card):
+        launch_jobs._execute_jobs(args, "/fluka/bin")
+    assert not (tmp_path / "sim").exists()
+
+
+def test_allocate_seeds_distinct_and_unused():
+    used = set(range(1, 1001))
+    before = set(used)
+    seeds = fluka.allocate_seeds(used, 500)
+    assert len(seeds) == 500
+    assert len(set(seeds)) == 500
+    assert not set(seeds) & before
+    assert all(1 <= s <= fluka._SEED_MAX for s in seeds)
+    assert used == before | set(seeds)
+
+
+def test_detect_fluka_path_uses_environment(monkeypatch):
+    monkeypatch.setenv("FLUKA_BIN", "/env/bin")
+    monkeypatch.setenv("FLUKA_PATH", "/env")
+
+    def _no_subprocess(*_args, **_kwargs):
+        raise AssertionError("fluka-config should not be called")
+
+    monkeypatch.setattr(fluka.subprocess, "check_output", _no_subprocess)
+    assert fluka.detect_fluka_path() == ("/env/bin", "/env")
+
+
+def test_detect_fluka_path_queries_fluka_config(monkeypatch):
+    monkeypatch.delenv("FLUKA_BIN", raising=False)
+    monkeypatch.delenv("FLUKA_PATH", raising=False)
+    answers = {"--bin": b"/cfg/bin\n", "--path": b"/cfg\n"}
+    monkeypatch.setattr(fluka.subprocess, "check_output", lambda cmd: answers[cmd[1]])
+    assert fluka.detect_fluka_path() == ("/cfg/bin", "/cfg")
+    assert "FLUKA_BIN" not in os.environ
+
+
+def test_template_keeps_non_ascii_bytes(tmp_path):
+    inp = _write_inp(tmp_path, b"* caf\xe9\n" + INP)
+    template = fluka.load_input_template(str(inp))
+    assert template.prefix.startswith(b"* caf\xe9\n")
+
+
+def test_parse_randomiz_with_non_ascii_comment(tmp_path):
+    inp = _write_inp(tmp_path, b"* caf\xe9 \xff\n" + INP)
+    assert fluka.parse_randomiz(inp) == 1234
+
+
+def test_launch_with_non_ascii_comment(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_inp(tmp_path, b"* caf\xe9\n" + INP)
+    args = Namespace(
+        backend="slurm", input="sim.inp", njobs=2, custom_exe=None, use_dpm=False,
+        output_dir=None, nprim=None, dry_run=True,
+        queue="production", mem="1500", ntasks=1, nodes=1, time="1-00:00:00", gres="disk:1G",
+    )
+    launch_jobs._execute_jobs(args, "/fluka/bin")
+
+    inputs = sorted((tmp_path / "sim").glob("job_*/sim_*.inp"))
+    assert [p.name for p in inputs] == ["sim_0001.inp", "sim_0002.inp"]
+    for inp in inputs:
+        data = inp.read_bytes()
+        assert data.startswith(b"* caf\xe9\nTITLE\n")
+        assert data.endswith(b"STOP\n")
+    seeds = {fluka.parse_randomiz(p) for p in inputs}
+    assert len(seeds) == 2
@@ -0,0 +1,45 @@
+import logging
+from argparse import ArgumentParser
+
+from backends.base import JobInfo
+from backends.htcondor import HTCondorBackend
+
+
+def _args(backend):
+    parser = ArgumentParser()
+    backend.add_args(parser)
+    args = parser.parse_args([])
+    args.dry_run = True
+    return args
+
+
+def _jobs(output_dir, n):
+    return [
+        (None, JobInfo(f"sim_{i:04d}.inp", i, "/fluka/bin", None,
+                       job_dir=str(output_dir / f"job_{i:04d}"), base_name="sim"))
+        for i in range(1, n + 1)
+    ]
+
+
+def test_dry_run_submit_description(tmp_path, caplog):
+    backend = HTCondorBackend()
+    with caplog.at_level(logging.INFO):
+        backend.submit_batch(_jobs(tmp_path, 4), _args(backend))
+
+    [record] = caplog.records
+    message = record.getMessage()
+    assert message.startswith("Job 1-4: [dry run] condor_submit")
+    assert message.endswith("(queue 4)")
+    assert "'JobIndex': '$(Process) + 1'" in message
+    assert f"'executable': '{tmp_path}/sim_condor.sh'" in message
+    assert "'arguments': 'sim_$INT(JobIndex,%04d).inp'" in message
+    assert f"'initialdir': '{tmp_path}/job_$INT(JobIndex,%04d)'" in message
+    assert "'transfer_input_files': 'sim_$INT(JobIndex,%04d).inp'" in message
+
+
+def test_single_shared_script(tmp_path):
+    backend = HTCondorBackend()
+    backend.submit_batch(_jobs(tmp_path, 3), _args(backend))
+    assert [p.name for p in tmp_path.iterdir()] == ["sim_condor.sh"]
+    script = (tmp_path / "sim_condor.sh").read_text()
+    assert script.rstrip().endswith("/fluka/bin/rfluka -M 1 $1")
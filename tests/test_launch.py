@@ -0,0 +1,94 @@
+from argparse import Namespace
+
+import pytest
+
+import launch_jobs
+from core import config, display, fluka
+
+SLURM_YAML = "backend: slurm\ninput: {inp}\nnjobs: 2\n"
+
+
+@pytest.fixture
+def no_fluka(monkeypatch):
+    """Stub fluka-config and job execution; record the launched configs."""
+    launched: list[Namespace] = []
+    monkeypatch.setattr(fluka, "detect_fluka_path", lambda: ("/fluka/bin", "/fluka"))
+    monkeypatch.setattr(launch_jobs, "_execute_jobs", lambda args, path: launched.append(args))
+    return launched
+
+
+def _no_prompt(*_args):
+    raise AssertionError("confirm() should not be called")
+
+
+def test_yes_flag_parsed():
+    args = launch_jobs._build_parser().parse_args(["slurm", "-f", "sim.inp", "-n", "1", "-y"])
+    assert args.assume_yes is True
+
+
+def test_yaml_assume_yes(tmp_path):
+    path = tmp_path / "cfg.yaml"
+    path.write_text(SLURM_YAML.format(inp="sim.inp") + "assume_yes: true\n")
+    cfg = config.load_yaml_config(str(path), launch_jobs.BACKENDS)
+    assert cfg.assume_yes is True
+
+
+def test_yaml_bare_yes_key_rejected(tmp_path):
+    path = tmp_path / "cfg.yaml"
+    path.write_text(SLURM_YAML.format(inp="sim.inp") + "yes: true\n")
+    with pytest.raises(ValueError, match="assume_yes"):
+        config.load_yaml_config(str(path), launch_jobs.BACKENDS)
+
+
+def test_run_from_args_assume_yes_skips_prompt(monkeypatch, no_fluka):
+    monkeypatch.setattr(display, "confirm", _no_prompt)
+    args = launch_jobs._build_parser().parse_args(["slurm", "-f", "sim.inp", "-n", "1", "-y"])
+    launch_jobs.run_from_args(args)
+    assert no_fluka == [args]
+
+
+def test_run_folder_assume_yes_only_when_all_configs_set_it(tmp_path, monkeypatch, no_fluka):
+    (tmp_path / "a.yaml").write_text(SLURM_YAML.format(inp="sim.inp") + "assume_yes: true\n")
+    (tmp_path / "b.yaml").write_text(SLURM_YAML.format(inp="sim.inp") + "assume_yes: true\n")
+    monkeypatch.setattr(display, "confirm", _no_prompt)
+    launch_jobs.run_folder(str(tmp_path))
+    assert len(no_fluka) == 2
+
+    (tmp_path / "c.yaml").write_text(SLURM_YAML.format(inp="sim.inp"))
+    prompts = []
+    monkeypatch.setattr(display, "confirm", lambda *a: prompts.append(a) or False)
+    launch_jobs.run_folder(str(tmp_path))
+    assert len(prompts) == 1
+    assert len(no_fluka) == 2
+
+
+class _Stream:
+    def __init__(self, tty: bool) -> None:
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        return self._tty
+
+
+@pytest.mark.parametrize("stdin_tty, stdout_tty, expected", [
+    (True, True, True),
+    (True, False, True),    # python launch_jobs.py ... | tee launch.log
+    (False, True, True),
+    (False, False, False),
+])
+def test_show_summary(monkeypatch, stdin_tty, stdout_tty, expected):
+    monkeypatch.setattr(launch_jobs.sys, "stdin", _Stream(stdin_tty))
+    monkeypatch.setattr(launch_jobs.sys, "stdout", _Stream(stdout_tty))
+    assert launch_jobs._show_summary() is expected
+
+
+@pytest.mark.parametrize("show", [True, False])
+def test_run_from_args_table_only_when_shown(monkeypatch, no_fluka, show):
+    tables = []
+    monkeypatch.setattr(launch_jobs, "_show_summary", lambda: show)
+    monkeypatch.setattr(display, "print_table", tables.append)
+    monkeypatch.setattr(display, "confirm", lambda *a: True)
+    args = launch_jobs._build_parser().parse_args(["slurm", "-f", "sim.inp", "-n", "1"])
+    launch_jobs.run_from_args(args)
+    assert len(tables) == (1 if show else 0)
+    assert no_fluka == [args]
@@ -0,0 +1,58 @@
+import logging
+from argparse import ArgumentParser
+
+from backends.base import JobInfo
+from backends.lsf import LSFBackend
+
+
+def _args(backend):
+    parser = ArgumentParser()
+    backend.add_args(parser)
+    args = parser.parse_args([])
+    args.dry_run = True
+    return args
+
+
+def _jobs(output_dir, n):
+    return [
+        (None, JobInfo(f"sim_{i:04d}.inp", i, "/fluka/bin", None,
+                       job_dir=str(output_dir / f"job_{i:04d}"), base_name="sim"))
+        for i in range(1, n + 1)
+    ]
+
+
+def test_array_script(tmp_path):
+    backend = LSFBackend()
+    backend.submit_batch(_jobs(tmp_path, 3), _args(backend))
+    script = (tmp_path / "sim_array_0001-0003.sh").read_text()
+    assert '#BSUB -J "sim[1-3]"' in script
+    assert "#BSUB -q normal" in script
+    assert f"#BSUB -o {tmp_path}/%J_%I.out" in script
+    assert "index=$(printf '%04d' $((LSB_JOBINDEX + 0)))" in script
+    assert f"cd {tmp_path}/job_$index" in script
+    assert f"/fluka/bin/rfluka -M 1 {tmp_path}/job_$index/sim_$index.inp" in script
+
+
+def test_large_launch_split_into_arrays_indexed_from_one(tmp_path, caplog):
+    backend = LSFBackend()
+    with caplog.at_level(logging.INFO):
+        backend.submit_batch(_jobs(tmp_path, 2500), _args(backend))
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "sim_array_0001-1000.sh", "sim_array_1001-2000.sh", "sim_array_2001-2500.sh",
+    ]
+    second = (tmp_path / "sim_array_1001-2000.sh").read_text()
+    assert '#BSUB -J "sim[1-1000]"' in second
+    assert "$((LSB_JOBINDEX + 1000))" in second
+    last = (tmp_path / "sim_array_2001-2500.sh").read_text()
+    assert '#BSUB -J "sim[1-500]"' in last
+    assert "$((LSB_JOBINDEX + 2000))" in last
+    assert "Job 2001-2500: [dry run] bsub <" in caplog.text
+
+
+def test_no_per_job_script(tmp_path):
+    backend = LSFBackend()
+    job_dir = tmp_path / "job_0001"
+    job_dir.mkdir()
+    _, job_info = _jobs(tmp_path, 1)[0]
+    assert backend.generate_script(job_info, str(job_dir), _args(backend)) is None
+    assert list(job_dir.iterdir()) == []
@@ -0,0 +1,29 @@
+import logging
+import subprocess
+from argparse import Namespace
+
+from backends.base import JobInfo
+from backends.ts import TSBackend
+
+
+def test_jobs_enqueued_from_their_job_dir(tmp_path, monkeypatch, caplog):
+    calls = []
+
+    def _run(cmd, **kwargs):
+        calls.append((cmd, kwargs["cwd"]))
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"{len(calls)}\n", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    jobs = [
+        (None, JobInfo(f"sim_{i:04d}.inp", i, "/fluka/bin", None,
+                       job_dir=str(tmp_path / f"job_{i:04d}"), base_name="sim"))
+        for i in (1, 2)
+    ]
+    with caplog.at_level(logging.INFO):
+        TSBackend().submit_batch(jobs, Namespace(dry_run=False))
+
+    assert calls == [
+        (["ts", "/fluka/bin/rfluka", "-M", "1", "sim_0001.inp"], str(tmp_path / "job_0001")),
+        (["ts", "/fluka/bin/rfluka", "-M", "1", "sim_0002.inp"], str(tmp_path / "job_0002")),
+    ]
+    assert "Job 2: 2" in caplog.text